@@ -1,7 +1,65 @@
 import reciprocalspaceship as rs
-import pandas as pd
 import numpy as np
 
+# Miller indices are packed into a single int64 key for fast lookups.
+# This supports indices in the range [-_MILLER_OFFSET, _MILLER_OFFSET).
+_MILLER_OFFSET = 1024
+_MILLER_BASE = 2 * _MILLER_OFFSET
+
+def pack_miller_indices(H, asu_id=None):
+    """
+    Parameters
+    ----------
+    H : np.array
+        (n x 3) array of miller indices
+    asu_id : np.array (optional)
+        (n x 1) array of asu ids to prepend to the key
+
+    Returns
+    -------
+    key : np.array
+        (n,) int64 array with one unique integer key per miller index
+    """
+    # The key is accumulated in place to avoid an n-length temporary per operation
+    H = np.array(H, dtype=np.int64)
+    H += _MILLER_OFFSET
+    if H.size > 0 and (H.min() < 0 or H.max() >= _MILLER_BASE):
+        raise ValueError(f"Miller indices must lie in [{-_MILLER_OFFSET}, {_MILLER_OFFSET})")
+    key = H[:,0] * _MILLER_BASE
+    key += H[:,1]
+    key *= _MILLER_BASE
+    key += H[:,2]
+    if asu_id is not None:
+        asu_id = np.array(asu_id, dtype=np.int64).ravel()
+        asu_id *= _MILLER_BASE**3
+        key += asu_id
+    return key
+
+def lookup_sorted_keys(sorted_keys, sorted_ids, key):
+    """
+    Look up the ids corresponding to integer keys in a sorted key table. 
+
+    Parameters
+    ----------
+    sorted_keys : np.array
+        Sorted array of unique integer keys
+    sorted_ids : np.array
+        Ids corresponding to each entry in sorted_keys
+    key : np.array
+        Array of query keys
+
+    Returns
+    -------
+    ids : np.array
+        The ids corresponding to each query key
+    """
+    idx = np.searchsorted(sorted_keys, key)
+    idx = np.minimum(idx, len(sorted_keys) - 1)
+    missing = sorted_keys[idx] != key
+    if np.any(missing):
+        raise KeyError(f"{missing.sum()} queried reflections are not present in the lookup table")
+    return sorted_ids[idx]
+
 class ReciprocalASU():
     def __init__(self, cell, spacegroup, dmin, anomalous):
         """
@@ -20,38 +78,69 @@ class ReciprocalASU():
         self.spacegroup = spacegroup
         self.dmin = dmin
         self.anomalous = anomalous
+        # Miller indices comfortably fit in int16 which keeps lookups lean
         self.Hall = rs.utils.generate_reciprocal_asu(
                 self.cell, 
                 self.spacegroup, 
                 self.dmin, 
                 self.anomalous
-            )
+            ).astype(np.int16)
         h,k,l = self.Hall.T
         lookup_table = rs.DataSet({
             'H' : h,
             'K' : k,
             'L' : l,
-            'id' : np.arange(len(h))
+            'id' : np.arange(len(h), dtype=np.int32)
             }, 
             cell=cell,
             spacegroup=spacegroup,
         ).compute_multiplicity().label_centrics().compute_dHKL()
         self.lookup_table = lookup_table
+        self._centric = lookup_table['CENTRIC'].to_numpy('bool')
+        self._multiplicity = lookup_table['EPSILON'].to_numpy('float32')
+        self._dHKL = lookup_table['dHKL'].to_numpy('float32')
+
+        # The dense refl_id grid used by to_refl_id is built on first use
+        self._id_grid = None
+
+    def __getstate__(self):
+        # The refl_id grid can be large and is cheap to rebuild, so it is not pickled
+        state = self.__dict__.copy()
+        state['_id_grid'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        # Objects pickled by older versions lack the cached lookup arrays
+        if '_dHKL' not in state:
+            self.__init__(self.cell, self.spacegroup, self.dmin, self.anomalous)
+
+    def _get_id_grid(self):
+        """
+        Dense grid of refl_ids spanning the bounding box of the ASU. Entries outside the ASU are -1.
+        The grid is indexed by miller index minus self._hkl_min.
+        """
+        if self._id_grid is None:
+            self._hkl_min = self.Hall.min(axis=0)
+            shape = tuple(self.Hall.max(axis=0) - self._hkl_min + 1)
+            self._id_grid = -np.ones(shape, dtype=np.int32)
+            self._id_grid[tuple((self.Hall - self._hkl_min).T)] = self.lookup_table['id'].to_numpy('int32')
+        return self._id_grid
 
     @property
     def centric(self):
         """ boolean array true for centric refl_ids """
-        return self.lookup_table.CENTRIC.to_numpy('bool')
+        return self._centric
 
     @property
     def multiplicity(self):
         """ the multiplicity of each structure factor """
-        return self.lookup_table.EPSILON.to_numpy('float32')
+        return self._multiplicity
 
     @property
     def dHKL(self):
-        """ the multiplicity of each structure factor """
-        return self.lookup_table.dHKL.to_numpy('float32')
+        """ the resolution of each structure factor """
+        return self._dHKL
 
     def to_refl_id(self, H):
         """
@@ -65,8 +154,14 @@ class ReciprocalASU():
         refl_id : np.array
             (n x 1) array of integer reflection ids
         """
-        idx = pd.MultiIndex.from_arrays(H.T, names = ['H', 'K', 'L'])
-        return self.lookup_table.set_index(['H','K','L']).loc[idx, 'id']
+        id_grid = self._get_id_grid()
+        idx = np.asarray(H, dtype=np.int64) - self._hkl_min
+        in_grid = np.all((idx >= 0) & (idx < id_grid.shape), axis=1)
+        refl_id = -np.ones(len(idx), dtype=np.int32)
+        refl_id[in_grid] = id_grid[tuple(idx[in_grid].T)]
+        if np.any(refl_id < 0):
+            raise KeyError(f"{np.sum(refl_id < 0)} queried miller indices are not in the reciprocal ASU")
+        return refl_id
 
     def to_miller_index(self, refl_id):
         """
@@ -80,7 +175,7 @@ class ReciprocalASU():
         H : np.array
             (n x 3) array of miller indices 
         """
-        return self.lookup_table.set_index('id').loc[refl_id].get_hkls()
+        return self.Hall[np.asarray(refl_id).flatten()]
 
 class ReciprocalASUCollection():
     def __init__(self, reciprocal_asus):
@@ -91,42 +186,61 @@ class ReciprocalASUCollection():
             A list of ReciprocalAsu instances
         """
         self.reciprocal_asus = reciprocal_asus
-        self.lookup_table = None
+        tabs = []
+        offset = 0
         for asu_id,asu in enumerate(self.reciprocal_asus):
             tab = asu.lookup_table.copy()
             tab['asu_id'] = asu_id
-            if self.lookup_table is not None:
-                tab['id'] += len(self.lookup_table)
-                self.lookup_table = rs.concat((self.lookup_table, tab), check_isomorphous=False)
-            else:
-                self.lookup_table =  tab
-        self.asu_and_miller_lookup_table = self.lookup_table.set_index(['asu_id', 'H', 'K', 'L'])
+            tab['id'] += offset
+            offset += len(tab)
+            tabs.append(tab)
+        self.lookup_table = rs.concat(tabs, check_isomorphous=False)
         self.refl_id_lookup_table = self.lookup_table.set_index('id')
 
+        # Materialize the per refl_id arrays once. The refl_ids run from 0 to
+        # n-1, so the position in these arrays is the refl_id.
+        table = self.refl_id_lookup_table.sort_index()
+        self._centric = table['CENTRIC'].to_numpy('bool')
+        self._multiplicity = table['EPSILON'].to_numpy('float32')
+        self._dHKL = table['dHKL'].to_numpy('float32')
+        self._hkls = np.column_stack([table[key].to_numpy('int16') for key in ('H', 'K', 'L')])
+        self._asu_ids = table['asu_id'].to_numpy('int64')
+
+        # Sorted key table for the inverse lookup
+        key = pack_miller_indices(self._hkls, self._asu_ids)
+        self._sorted_ids = np.argsort(key)
+        self._sorted_keys = key[self._sorted_ids]
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        # Objects pickled by older versions lack the cached lookup arrays
+        if '_sorted_keys' not in state:
+            self.__init__(self.reciprocal_asus)
+
     @property
     def centric(self):
         """ boolean array true for centric refl_ids """
-        return self.refl_id_lookup_table.CENTRIC.to_numpy('bool')
+        return self._centric
 
     @property
     def multiplicity(self):
         """ the multiplicity of each structure factor """
-        return self.refl_id_lookup_table.EPSILON.to_numpy('float32')
+        return self._multiplicity
 
     @property
     def dHKL(self):
-        """ the multiplicity of each structure factor """
-        return self.lookup_table.dHKL.to_numpy('float32')
+        """ the resolution of each structure factor """
+        return self._dHKL
 
     @property
     def hkls(self):
-        """ the multiplicity of each structure factor """
-        return self.refl_id_lookup_table.get_hkls()
+        """ the miller indices of each structure factor """
+        return self._hkls
 
     @property
     def asu_ids(self):
-        """ the multiplicity of each structure factor """
-        return self.refl_id_lookup_table.asu_id.to_numpy('int')
+        """ the asu id of each structure factor """
+        return self._asu_ids
 
     def to_asu_id_and_miller_index(self, refl_id):
         """
@@ -142,10 +256,8 @@ class ReciprocalASUCollection():
         H : np.array
             (n x 3) array of miller indices 
         """
-        data = self.refl_id_lookup_table.loc[refl_id.flatten()]
-        H = data.get_hkls()
-        asu_id = data['asu_id'].to_numpy('int')
-        return asu_id[:,None], H
+        refl_id = np.asarray(refl_id, dtype=np.int64).flatten()
+        return self._asu_ids[refl_id][:,None], self._hkls[refl_id]
 
     def to_refl_id(self, asu_id, H):
         """
@@ -161,9 +273,8 @@ class ReciprocalASUCollection():
         refl_id : np.array
             (n x 1) array of integer reflection ids to convert to miller indices
         """
-        idx = np.concatenate((asu_id, H), axis=1).astype('int')
-        idx = pd.MultiIndex.from_arrays(idx.T, names = ['asu_id', 'H', 'K', 'L'])
-        return self.asu_and_miller_lookup_table.loc[idx, 'id'].to_numpy('int')
+        key = pack_miller_indices(H, asu_id)
+        return lookup_sorted_keys(self._sorted_keys, self._sorted_ids, key)
 
     def __getitem__(self, i):
         return self.reciprocal_asus[i]
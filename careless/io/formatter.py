@@ -1,17 +1,15 @@
 import numpy as np
+import pandas as pd
 import tensorflow as tf
 import reciprocalspaceship as rs
 import gemmi
-from .asu import ReciprocalASU,ReciprocalASUCollection
+from .asu import ReciprocalASU,ReciprocalASUCollection,pack_miller_indices
 from careless.models.base import BaseModel
 from careless.utils.positional_encoding import positional_encoding
 from typing import Optional
 
 def get_first_key_of_dtype(ds, dtype):
-    matches = ds.dtypes[ds.dtypes == dtype].keys()
-    for match in matches:
-        return match
-    return None
+    return next((k for k,v in ds.dtypes.items() if v == dtype), None)
 
 class DataFormatter():
     """
@@ -81,7 +79,13 @@ class DataFormatter():
             reciprocal_asus.append(ReciprocalASU(data.cell, data.spacegroup, data.dHKL.min(), self.anomalous))
 
         rac = ReciprocalASUCollection(reciprocal_asus)
-        data['image_id'] = data.groupby(['file_id', 'image_id']).ngroup()
+
+        # Equivalent to data.groupby(['file_id', 'image_id']).ngroup(), but
+        # hashes a single packed int64 key instead of a MultiIndex. The raw
+        # image keys are factorized first so non-integer keys stay distinct.
+        image_id,images = pd.factorize(data['image_id'].to_numpy(), sort=True)
+        key = data['file_id'].to_numpy('int64') * len(images) + image_id
+        data['image_id'] = pd.factorize(key, sort=True)[0]
         return data, rac
 
     def __call__(self, datasets):
@@ -307,9 +311,13 @@ class MonoFormatter(DataFormatter):
         asu_collection : careless.io.asu.ReciprocalASUCollection
             A collection of reciprocal asus to aid in intepreting results.
         """
-        data['dHKL'] = data.dHKL**-2.
-        metadata = data[self.metadata_keys].to_numpy('float32')
-        metadata = (metadata - metadata.mean(0)) / metadata.std(0)
+        dHKL = data['dHKL'].to_numpy('float32', copy=True)
+        np.reciprocal(dHKL, out=dHKL)
+        dHKL *= dHKL
+        data['dHKL'] = dHKL
+        metadata = data[self.metadata_keys].to_numpy('float32', copy=True)
+        metadata -= metadata.mean(0)
+        metadata /= metadata.std(0)
 
         if self.positional_encoding_keys is not None:
             to_encode = data[self.positional_encoding_keys].to_numpy('float32')
@@ -546,12 +554,20 @@ class LaueFormatter(DataFormatter):
         asu_collection : careless.io.asu.ReciprocalASUCollection
             A collection of reciprocal asus to aid in intepreting results.
         """
-        data = data.copy() #This is maybe overkill
-        data['harmonic_id'] = data.groupby(['image_id', 'H_0', 'K_0', 'L_0']).ngroup()
+        # Equivalent to data.groupby(['image_id', 'H_0', 'K_0', 'L_0']).ngroup()
+        key = pack_miller_indices(
+            data[['H_0', 'K_0', 'L_0']].to_numpy('int64'),
+            data['image_id'].to_numpy('int64'),
+        )
+        data['harmonic_id'] = pd.factorize(key, sort=True)[0]
 
-        data['dHKL'] = data.dHKL**-2.
-        metadata = data[self.metadata_keys].to_numpy('float32')
-        metadata = (metadata - metadata.mean(0)) / metadata.std(0)
+        dHKL = data['dHKL'].to_numpy('float32', copy=True)
+        np.reciprocal(dHKL, out=dHKL)
+        dHKL *= dHKL
+        data['dHKL'] = dHKL
+        metadata = data[self.metadata_keys].to_numpy('float32', copy=True)
+        metadata -= metadata.mean(0)
+        metadata /= metadata.std(0)
 
         if self.positional_encoding_keys is not None:
             to_encode = data[self.positional_encoding_keys].to_numpy('float32')
@@ -563,10 +579,14 @@ class LaueFormatter(DataFormatter):
             data.get_hkls(),
             )
 
-        iobs  = data[['harmonic_id',   'intensity']].groupby('harmonic_id').first().to_numpy('float32')
-        sigma = data[['harmonic_id', 'uncertainty']].groupby('harmonic_id').first().to_numpy('float32')
-        iobs  = np.pad( iobs, [[0, len(refl_id) - len( iobs)], [0, 0]], constant_values=1.)
-        sigma = np.pad(sigma, [[0, len(refl_id) - len(sigma)], [0, 0]], constant_values=1.)
+        # Scatter the first intensity and uncertainty of each harmonic_id.
+        # Assigning in reverse order leaves the first value of each group in 
+        # place. Entries beyond the number of observations are padding.
+        harmonic_id = data['harmonic_id'].to_numpy('int64')
+        iobs  = np.ones((len(refl_id), 1), dtype='float32')
+        sigma = np.ones((len(refl_id), 1), dtype='float32')
+        iobs[harmonic_id[::-1], 0]  = data['intensity'].to_numpy('float32')[::-1]
+        sigma[harmonic_id[::-1], 0] = data['uncertainty'].to_numpy('float32')[::-1]
 
         inputs = {
             'refl_id'   : refl_id[:,None],
@@ -575,7 +595,7 @@ class LaueFormatter(DataFormatter):
             'intensities'   : iobs,
             'uncertainties'   : sigma,
             'wavelength' : data[self.wavelength_key].to_numpy('float32')[:,None],
-            'harmonic_id' : data['harmonic_id'].to_numpy('int64')[:,None],
+            'harmonic_id' : harmonic_id[:,None],
         }
 
         return self.pack_inputs(inputs), rac
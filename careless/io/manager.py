@@ -10,7 +10,38 @@ class DataManager():
     This class comprises various data manipulation methods as well as methods to aid in model construction.
     """
     parser = None
-    def __init__(self, inputs, asu_collection, parser=None):
+
+    # MTZ dtypes of the columns written by get_predictions
+    prediction_dtypes = {
+        'H' : 'H',
+        'K' : 'H',
+        'L' : 'H',
+        'Iobs' : 'J',
+        'SigIobs' : 'Q',
+        'Ipred' : 'J',
+        'SigIpred' : 'Q',
+    }
+
+    # MTZ dtypes of the columns written by get_results. Surrogate 
+    # parameters are always written with the 'R' dtype.
+    result_dtypes = {
+        'H' : 'H',
+        'K' : 'H',
+        'L' : 'H',
+        'F' : 'F',
+        'SigF' : 'Q',
+        'N' : 'R',
+    }
+
+    # Positions of frequently accessed inputs. These are class attributes so 
+    # that they are also available on unpickled managers.
+    _refl_id_idx = BaseModel.get_index_by_name('refl_id')
+    _iobs_idx = BaseModel.get_index_by_name('intensities')
+    _sigiobs_idx = BaseModel.get_index_by_name('uncertainties')
+    _image_id_idx = BaseModel.get_index_by_name('image_id')
+    _harmonic_id_idx = BaseModel.get_index_by_name('harmonic_id')
+
+    def __init__(self, inputs, asu_collection, parser=None, seed=None):
         """
         Parameters
         ----------
@@ -18,11 +49,25 @@ class DataManager():
         asu_collection : ReciprocalASUCollection
         parser : Namespace (optional)
             A Namespace instance created by careless.parser.parser.parse_args()
+        seed : int (optional)
+            Seed for the random number generator used to split data. If None,
+            parser.seed will be used when a parser is supplied.
         """
         self.inputs = inputs
         self.asu_collection = asu_collection
         self.parser = parser
 
+        if seed is None and parser is not None:
+            seed = parser.seed
+        self._rng = np.random.default_rng(seed)
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        # Managers pickled by older versions have no random generator
+        if '_rng' not in state:
+            seed = None if self.parser is None else self.parser.seed
+            self._rng = np.random.default_rng(seed)
+
     @classmethod
     def from_pickle(cls, filename):
         import pickle
@@ -66,11 +111,33 @@ class DataManager():
             inputs = self.inputs
 
         inputs = tuple(inputs)
-        iobs = BaseModel.get_intensities(inputs)
-        sigiobs = BaseModel.get_uncertainties(inputs)
+        iobs = inputs[self._iobs_idx]
+        sigiobs = inputs[self._sigiobs_idx]
         packed  = (inputs, iobs, sigiobs)
-        tfds = tf.data.Dataset.from_tensor_slices(packed)
-        return tfds.batch(len(iobs))
+        return tf.data.Dataset.from_tensors(packed)
+
+    def _slice_by_asu(self, asu_id):
+        """
+        Sort reflections by asu_id once so that each asu is a contiguous slice.
+
+        Parameters
+        ----------
+        asu_id : np.array
+            Array of asu ids for each reflection.
+
+        Returns
+        -------
+        order : np.array
+            Stable ordering of the reflections by asu_id.
+        slices : list
+            For each asu in self.asu_collection, the slice of the sorted reflections 
+            belonging to it.
+        """
+        asu_id = np.asarray(asu_id).flatten()
+        order = np.argsort(asu_id, kind='stable')
+        bounds = np.searchsorted(asu_id[order], np.arange(len(self.asu_collection) + 1))
+        slices = [slice(start, stop) for start,stop in zip(bounds[:-1], bounds[1:])]
+        return order, slices
 
     def get_predictions(self, model, inputs=None):
         """ 
@@ -92,19 +159,22 @@ class DataManager():
         if inputs is None:
             inputs = self.inputs
 
-        refl_id = BaseModel.get_refl_id(inputs)
-        iobs = BaseModel.get_intensities(inputs).flatten()
-        sig_iobs = BaseModel.get_uncertainties(inputs).flatten()
+        refl_id = inputs[self._refl_id_idx]
+        iobs = inputs[self._iobs_idx].flatten()
+        sig_iobs = inputs[self._sigiobs_idx].flatten()
         asu_id,H = self.asu_collection.to_asu_id_and_miller_index(refl_id)
         #ipred = model(inputs)
         ipred,sigipred = model.prediction_mean_stddev(inputs)
 
-        h,k,l = H.T
+        order,slices = self._slice_by_asu(asu_id)
+        # Gather the columns as rows of a single block so each per asu 
+        # column is a contiguous slice
+        h,k,l = H.T[:,order]
+        iobs,sig_iobs,ipred,sigipred = np.stack((iobs, sig_iobs, ipred, sigipred)).astype('float32')[:,order]
+
         results = ()
-        for i,asu in enumerate(self.asu_collection):
-            idx = asu_id == i
-            idx = idx.flatten()
-            output = rs.DataSet({
+        for asu,idx in zip(self.asu_collection, slices):
+            data = {
                 'H' : h[idx],
                 'K' : k[idx],
                 'L' : l[idx],
@@ -112,11 +182,17 @@ class DataManager():
                 'SigIobs' : sig_iobs[idx],
                 'Ipred' : ipred[idx],
                 'SigIpred' : sigipred[idx],
-                }, 
+            }
+            # Cast each column individually, because DataSet.astype does not
+            # preserve the cell, spacegroup and merged attributes with older 
+            # versions of pandas.
+            data = {key : rs.DataSeries(val, dtype=self.prediction_dtypes[key]) for key,val in data.items()}
+            output = rs.DataSet(
+                data,
                 cell=asu.cell, 
                 spacegroup=asu.spacegroup,
                 merged=False,
-            ).infer_mtz_dtypes().set_index(['H', 'K', 'L'])
+            ).set_index(['H', 'K', 'L'])
             results += (output, )
         return results
 
@@ -144,40 +220,62 @@ class DataManager():
             inputs = self.inputs
         F = surrogate_posterior.mean().numpy()
         SigF = surrogate_posterior.stddev().numpy()
+        asu_id,H = self.asu_collection.to_asu_id_and_miller_index(np.arange(len(F)))
+        refl_id = inputs[self._refl_id_idx]
+
+        order,slices = self._slice_by_asu(asu_id)
+        h,k,l = H.T[:,order]
+        # The redundancy is cast directly into its float32 row. It stays a 
+        # float so unobserved anomalous mates are NaN after unstacking.
+        block = np.empty((3, len(F)), dtype='float32')
+        block[0] = F
+        block[1] = SigF
+        block[2] = np.bincount(refl_id.ravel(), minlength=len(F))
+        F,SigF,N = block[:,order]
+
         params = None
         if output_parameters:
             params = {}
-            for k in sorted(surrogate_posterior.parameter_properties()):
-                v = surrogate_posterior.parameters[k]
+            for name in sorted(surrogate_posterior.parameter_properties()):
+                v = surrogate_posterior.parameters[name]
                 numpify = lambda x : tf.convert_to_tensor(x).numpy()
-                params[k] = numpify(v).flatten() * np.ones(len(F), dtype='float32')
-        asu_id,H = self.asu_collection.to_asu_id_and_miller_index(np.arange(len(F)))
-        h,k,l = H.T
-        refl_id = BaseModel.get_refl_id(inputs)
-        N = np.bincount(refl_id.flatten(), minlength=len(F)).astype('float32')
+                v = numpify(v).astype('float32').flatten()
+                if v.size == 1:
+                    # Scalar parameters are broadcast as zero-copy views
+                    params[name] = np.broadcast_to(v, len(F))
+                else:
+                    params[name] = v[order]
+
+        dtypes = dict(self.result_dtypes)
+        if params is not None:
+            dtypes.update({key : 'R' for key in params})
+
         results = ()
-        for i,asu in enumerate(self.asu_collection):
-            idx = asu_id == i
-            idx = idx.flatten()
-            output = rs.DataSet({
+        for asu,idx in zip(self.asu_collection, slices):
+            data = {
                 'H' : h[idx],
                 'K' : k[idx],
                 'L' : l[idx],
                 'F' : F[idx],
                 'SigF' : SigF[idx],
                 'N' : N[idx],
-                }, 
+            }
+            if params is not None:
+                for key in sorted(params.keys()):
+                    data[key] = params[key][idx]
+
+            # Remove unobserved refls before building the DataSet and its index.
+            # Columns are cast individually, because DataSet.astype does not
+            # preserve the cell, spacegroup and merged attributes with older 
+            # versions of pandas.
+            observed = data['N'] > 0
+            data = {key : rs.DataSeries(val[observed], dtype=dtypes[key]) for key,val in data.items()}
+            output = rs.DataSet(
+                data,
                 cell=asu.cell, 
                 spacegroup=asu.spacegroup,
                 merged=True,
-            ).infer_mtz_dtypes().set_index(['H', 'K', 'L'])
-            if params is not None:
-                for key in sorted(params.keys()):
-                    val = params[key]
-                    output[key] = rs.DataSeries(val[idx], index=output.index, dtype='R')
-
-            # Remove unobserved refls
-            output = output[output.N > 0] 
+            ).set_index(['H', 'K', 'L'])
 
             # Reformat anomalous data
             if asu.anomalous:
@@ -205,10 +303,11 @@ class DataManager():
         train : tuple
         test  : tuple
         """
-        test,train = (),()
-        for inp in self.inputs:
-            test  += (inp[ test_idx.flatten(),...] ,)
-            train += (inp[~test_idx.flatten(),...] ,)
+        test_idx = test_idx.flatten()
+        test_pos = np.flatnonzero(test_idx)
+        train_pos = np.flatnonzero(~test_idx)
+        test  = tuple(np.take(inp, test_pos, axis=0) for inp in self.inputs)
+        train = tuple(np.take(inp, train_pos, axis=0) for inp in self.inputs)
         return train, test
 
     def split_data_by_refl(self, test_fraction=0.5):
@@ -226,13 +325,13 @@ class DataManager():
         test  : tuple
         """
         if BaseModel.is_laue(self.inputs):
-            harmonic_id = BaseModel.get_harmonic_id(self.inputs)
-            test_idx = (np.random.random(harmonic_id.max()+1) <= test_fraction)[harmonic_id]
+            harmonic_id = self.inputs[self._harmonic_id_idx]
+            test_idx = (self._rng.random(harmonic_id.max()+1) <= test_fraction)[harmonic_id]
             train, test = self.split_laue_data_by_mask(test_idx)
             #return self.get_tf_dataset(train), self.get_tf_dataset(test)
             return train, test
 
-        test_idx = np.random.random(len(self.inputs[0])) <= test_fraction
+        test_idx = self._rng.random(len(self.inputs[0])) <= test_fraction
         train, test = self.split_mono_data_by_mask(test_idx)
         #return self.get_tf_dataset(train), self.get_tf_dataset(test)
         return train, test
@@ -253,28 +352,32 @@ class DataManager():
         train : tuple
         test  : tuple
         """
-        harmonic_id = BaseModel.get_harmonic_id(self.inputs)
+        harmonic_id = self.inputs[self._harmonic_id_idx]
 
         # Let us just test that the boolean mask is valid for these data.
         # If it does not split observations, isect should be empty
-        isect = np.intersect1d(
-            harmonic_id[test_idx].flatten(),
-            harmonic_id[~test_idx].flatten(),
-        )
+        nobs = harmonic_id.max() + 1
+        in_test = np.zeros(nobs, dtype=bool)
+        in_test[harmonic_id[test_idx]] = True
+        in_train = np.zeros(nobs, dtype=bool)
+        in_train[harmonic_id[~test_idx]] = True
+        isect = np.flatnonzero(in_test & in_train)
         if len(isect) > 0:
             raise ValueError(f"test_idx splits harmonic observations with harmonic_id : {isect}")
 
         def split(inputs, idx):
-            harmonic_id = BaseModel.get_harmonic_id(inputs)
-
+            # harmonic_id is a dense integer label, so the compact relabeling 
+            # can be computed with a cumulative sum instead of a sort
             result = ()
-            uni,inv = np.unique(harmonic_id[idx], return_inverse=True)
+            present = np.zeros(harmonic_id.max() + 1, dtype=bool)
+            present[harmonic_id[idx]] = True
+            uni = np.flatnonzero(present)
+            inv = (np.cumsum(present) - 1)[harmonic_id[idx]]
             for i,v in enumerate(inputs):
-                name = BaseModel.get_name_by_index(i)
-                if name in ('intensities', 'uncertainties'):
+                if i in (self._iobs_idx, self._sigiobs_idx):
                     v = v[uni]
                     v = np.pad(v, [[0, len(inv) - len(v)], [0, 0]], constant_values=1.)
-                elif name == 'harmonic_id':
+                elif i == self._harmonic_id_idx:
                     v = inv[:,None]
                 else:
                     v = v[idx.flatten(),...]
@@ -299,8 +402,8 @@ class DataManager():
         train : tuple
         test  : tuple
         """
-        image_id = BaseModel.get_image_id(self.inputs)
-        test_idx = np.random.random(image_id.max()+1) <= test_fraction
+        image_id = self.inputs[self._image_id_idx]
+        test_idx = self._rng.random(image_id.max()+1) <= test_fraction
 
         # Low image count edge case (mostly just for testing purposes)
         if True not in test_idx:
@@ -10,7 +10,8 @@ class ConvolvedLikelihood():
     Convolved log probability object for Laue data.
     """
     def __init__(self, distribution, harmonic_id):
-        self.harmonic_id = harmonic_id
+        # Convert the segment ids once rather than on every convolution
+        self.harmonic_id = tf.reshape(tf.cast(harmonic_id, tf.int32), (-1,))
         self.distribution = distribution
 
     def convolve(self, value):
@@ -20,7 +21,7 @@ class ConvolvedLikelihood():
         dimension for mc samples, ie shape=(b, n_predictions). 
         """
         tv = tf.transpose(value)
-        tr = tf.scatter_nd(self.harmonic_id, tv, tv.shape)
+        tr = tf.math.unsorted_segment_sum(tv, self.harmonic_id, tf.shape(tv)[0])
         return tf.transpose(tr)
 
     def mean(self, *args, **kwargs):
@@ -69,7 +70,7 @@ class StudentTLikelihood(LaueBase):
             Degrees of freedom of the t-distributed error model.
         """
         super().__init__()
-        self.dof = dof
+        self.dof = tf.constant(dof, dtype=tf.float32)
 
     def dist(self, loc, scale):
         loc = tf.squeeze(loc)
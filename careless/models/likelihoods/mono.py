@@ -27,7 +27,7 @@ class StudentTLikelihood(LocationScaleLikelihood):
             Degrees of freedom of the student t likelihood.
         """
         super().__init__()
-        self.dof = dof
+        self.dof = tf.constant(dof, dtype=tf.float32)
 
     def call(self, inputs):
         return tfd.StudentT(self.dof, *self.get_loc_and_scale(inputs))
@@ -42,6 +42,24 @@ class WilsonPrior(Prior):
         self.p_centric = Centric(self.epsilon, self.sigma)
         self.p_acentric = Acentric(self.epsilon, self.sigma)
 
+        # Distributions restricted to the centric and acentric reflections so 
+        # that log_prob and prob only evaluate each branch where it applies.
+        # _unsort restores the original order after concatenating the branches.
+        sigma = np.broadcast_to(self.sigma, self.epsilon.shape)
+        self._centric_idx = np.flatnonzero(self.centric)
+        self._acentric_idx = np.flatnonzero(~self.centric)
+        self._unsort = np.argsort(np.concatenate((self._centric_idx, self._acentric_idx)))
+        self._p_centric = Centric(self.epsilon[self._centric_idx], sigma[self._centric_idx])
+        self._p_acentric = Acentric(self.epsilon[self._acentric_idx], sigma[self._acentric_idx])
+
+    def _evaluate_branches(self, centric_fn, acentric_fn, x):
+        x = tf.convert_to_tensor(x)
+        result = tf.concat((
+            centric_fn(tf.gather(x, self._centric_idx, axis=-1)),
+            acentric_fn(tf.gather(x, self._acentric_idx, axis=-1)),
+        ), axis=-1)
+        return tf.gather(result, self._unsort, axis=-1)
+
     def log_prob(self, x):
         """
         Parameters
@@ -49,7 +67,7 @@ class WilsonPrior(Prior):
         x : tf.Tensor
             Array of structure factor values with the same shape epsilon and centric.
         """
-        return tf.where(self.centric, self.p_centric.log_prob(x), self.p_acentric.log_prob(x))
+        return self._evaluate_branches(self._p_centric.log_prob, self._p_acentric.log_prob, x)
 
     def prob(self, x):
         """
@@ -58,7 +76,7 @@ class WilsonPrior(Prior):
         x : tf.Tensor
             Array of structure factor values with the same shape epsilon and centric.
         """
-        return tf.where(self.centric, self.p_centric.prob(x), self.p_acentric.prob(x))
+        return self._evaluate_branches(self._p_centric.prob, self._p_acentric.prob, x)
 
     def mean(self):
         return tf.where(self.centric, self.p_centric.mean(), self.p_acentric.mean())
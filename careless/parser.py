@@ -77,32 +77,32 @@ class CustomFormatter(argparse.HelpFormatter):
 description = """
 Scale and merge crystallographic data by \n\n\n approximate inference.
 """
-parser = CustomParser(description=description, formatter_class=CustomFormatter)
-
-subs = parser.add_subparsers(title="Experiment Type", required=True, dest="type")
-mono_sub = subs.add_parser("mono", help="Process monochromatic diffraction data.", formatter_class=CustomFormatter)
-poly_sub = subs.add_parser("poly", help="Process polychromatic, 'Laue', diffraction data.", formatter_class=CustomFormatter)
-
 from careless.args import required,poly,groups
 
+# Arguments are registered once on parent parsers. The subparsers inherit 
+# their actions rather than re-adding them. The parents are listed in the 
+# order in which the arguments should appear in the help.
+required_parser = argparse.ArgumentParser(add_help=False)
 for args,kwargs in required.args_and_kwargs:
-    mono_sub.add_argument(*args, **kwargs)
-    poly_sub.add_argument(*args, **kwargs)
+    required_parser.add_argument(*args, **kwargs)
 
+poly_parser = argparse.ArgumentParser(add_help=False)
 for args,kwargs in poly.args_and_kwargs:
-    poly_sub.add_argument(*args, **kwargs)
+    poly_parser.add_argument(*args, **kwargs)
 
+common_parser = argparse.ArgumentParser(add_help=False)
 for group in groups:
     if group.name is not None and group.description is not None:
-        mono_group = mono_sub.add_argument_group(group.name, group.description)
-        poly_group = poly_sub.add_argument_group(group.name, group.description)
+        common_group = common_parser.add_argument_group(group.name, group.description)
     elif group.name is not None:
-        mono_group = mono_sub.add_argument_group(group.name)
-        poly_group = poly_sub.add_argument_group(group.name)
+        common_group = common_parser.add_argument_group(group.name)
     else:
-        mono_group = mono_sub
-        poly_group = poly_sub
+        common_group = common_parser
     for args,kwargs in group.args_and_kwargs:
-        mono_group.add_argument(*args, **kwargs)
-        poly_group.add_argument(*args, **kwargs)
+        common_group.add_argument(*args, **kwargs)
 
+parser = CustomParser(description=description, formatter_class=CustomFormatter)
+
+subs = parser.add_subparsers(title="Experiment Type", required=True, dest="type")
+mono_sub = subs.add_parser("mono", help="Process monochromatic diffraction data.", formatter_class=CustomFormatter, parents=[required_parser, common_parser])
+poly_sub = subs.add_parser("poly", help="Process polychromatic, 'Laue', diffraction data.", formatter_class=CustomFormatter, parents=[required_parser, poly_parser, common_parser])
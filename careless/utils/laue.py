@@ -31,9 +31,11 @@ def expand_harmonics(ds, dmin=None,  wavelength_key='Wavelength'):
     if 'Lobs' not in ds:
         raise KeyError("Expected 'Lobs' column in ds, but no 'Lobs' found")
 
-    ds = ds.copy()
+    # reset_index already returns a new DataSet, so only copy when H is a column
     if 'H' not in ds:
-        ds.reset_index(inplace=True)
+        ds = ds.reset_index()
+    else:
+        ds = ds.copy()
     if 'H' not in ds:
         raise ValueError("No column 'H' in index or columns")
 
@@ -29,6 +29,12 @@ def test_reciprocal_asu(dmin, anomalous, cell_and_spacegroups):
         refl_id = rasu.to_refl_id(Hall)
         assert np.all(refl_id == np.arange(len(Hall)))
 
+        # The refl_id grid is not pickled but is rebuilt on demand
+        import pickle
+        unpickled = pickle.loads(pickle.dumps(rasu))
+        assert unpickled._id_grid is None
+        assert np.all(unpickled.to_refl_id(Hall) == np.arange(len(Hall)))
+
         miller_index = rasu.to_miller_index(np.arange(len(Hall)))
         assert np.all(miller_index == Hall)
 
@@ -79,3 +85,20 @@ def test_double_reciprocal_asu_collection(dmin, anomalous, cell_and_spacegroups)
 
         dHKL = rac.dHKL
         assert np.all(np.isfinite(dHKL))
+
+
+def test_missing_refl_id(cell_and_spacegroups):
+    for cell,sg in cell_and_spacegroups:
+        rasu = ReciprocalASU(cell, sg, 5., False)
+        rac = ReciprocalASUCollection([rasu])
+
+        # This miller index is outside the bounding box of the asu
+        H = np.concatenate((rasu.Hall[:3], rasu.Hall.max(0, keepdims=True) + 1))
+        with pytest.raises(KeyError):
+            rasu.to_refl_id(H)
+        with pytest.raises(KeyError):
+            rac.to_refl_id(np.zeros((len(H), 1)), H)
+
+        # Nor is an asu_id which does not exist
+        with pytest.raises(KeyError):
+            rac.to_refl_id(np.ones((3, 1)), rasu.Hall[:3])
@@ -1,4 +1,5 @@
 import pytest
+import numpy as np
 import reciprocalspaceship as rs
 from careless.io.formatter import MonoFormatter,LaueFormatter
 from careless.models.base import BaseModel
@@ -105,3 +106,23 @@ def test_laue_formatter(
 
     metadata = BaseModel.get_metadata(inputs)
 
+
+
+@pytest.mark.parametrize('image_id_key', ['BATCH', 'X'])
+def test_mono_image_id(image_id_key, mono_data_set):
+    f = MonoFormatter('I', 'SigI', image_id_key, metadata_keys, False, False)
+    data,rac = f.get_data_and_asu_collection([mono_data_set.copy(), mono_data_set.copy()])
+    expected = data.groupby(['file_id', image_id_key]).ngroup().to_numpy('int64')
+    assert np.array_equal(data['image_id'].to_numpy('int64'), expected)
+
+
+@pytest.mark.parametrize('image_id_key', ['BATCH', 'X'])
+def test_laue_image_and_harmonic_id(image_id_key, laue_data_set):
+    f = LaueFormatter('Wavelength', 'I', 'SigI', image_id_key, metadata_keys, False, False, dmin=None)
+    data,rac = f.get_data_and_asu_collection([laue_data_set.copy(), laue_data_set.copy()])
+    expected = data.groupby(['file_id', image_id_key]).ngroup().to_numpy('int64')
+    assert np.array_equal(data['image_id'].to_numpy('int64'), expected)
+
+    inputs,rac = f.finalize(data, rac)
+    expected = data.groupby(['image_id', 'H_0', 'K_0', 'L_0']).ngroup().to_numpy('int64')
+    assert np.array_equal(BaseModel.get_harmonic_id(inputs).flatten(), expected)
@@ -23,8 +23,11 @@ def test_data_manager_laue(laue_inputs, laue_reciprocal_asu_collection):
         10000.,
     )
     results = dm.get_results(q)
-    for result in results:
+    for asu,result in zip(rac, results):
         assert result.N.min() > 0
+        assert result.cell.parameters == asu.cell.parameters
+        assert result.spacegroup.xhm() == asu.spacegroup.xhm()
+        assert result.merged
 
 def test_data_manager_mono(mono_inputs, mono_reciprocal_asu_collection):
     inputs = mono_inputs
@@ -44,5 +47,125 @@ def test_data_manager_mono(mono_inputs, mono_reciprocal_asu_collection):
         10000.,
     )
     results = dm.get_results(q)
+    for asu,result in zip(rac, results):
+        assert result.N.min() > 0
+        assert result.cell.parameters == asu.cell.parameters
+        assert result.spacegroup.xhm() == asu.spacegroup.xhm()
+        assert result.merged
+
+def test_data_manager_two_asus(cell_and_spacegroups):
+    from careless.io.asu import ReciprocalASU,ReciprocalASUCollection
+    import reciprocalspaceship as rs
+
+    cell,sg = cell_and_spacegroups[1]
+    rac = ReciprocalASUCollection([
+        ReciprocalASU(cell, sg, 5., False),
+        ReciprocalASU(cell, sg, 5., True),
+    ])
+    n_refls = len(rac.centric)
+
+    # Observe most reflections in both asus, some more than once
+    rng = np.random.default_rng(1234)
+    nobs = 2 * n_refls
+    refl_id = rng.choice(n_refls, nobs)
+    iobs = rng.random(nobs).astype('float32')
+    sigiobs = rng.random(nobs).astype('float32')
+    inputs = (
+        refl_id[:,None],
+        np.zeros((nobs, 1), dtype='int64'),
+        np.ones((nobs, 1), dtype='float32'),
+        iobs[:,None],
+        sigiobs[:,None],
+    )
+    dm = DataManager(inputs, rac)
+
+    class Model():
+        def prediction_mean_stddev(self, inputs):
+            return 2. * BaseModel.get_intensities(inputs).flatten(), 2. * BaseModel.get_uncertainties(inputs).flatten()
+
+    asu_id,H = rac.to_asu_id_and_miller_index(refl_id)
+    asu_id = asu_id.flatten()
+    predictions = dm.get_predictions(Model())
+    assert len(predictions) == 2
+    for i,(asu,prediction) in enumerate(zip(rac, predictions)):
+        assert prediction.cell.parameters == asu.cell.parameters
+        assert prediction.spacegroup.xhm() == asu.spacegroup.xhm()
+        assert not prediction.merged
+        for key,dtype in [('Iobs', 'J'), ('SigIobs', 'Q'), ('Ipred', 'J'), ('SigIpred', 'Q')]:
+            assert prediction[key].dtype.mtztype == dtype
+
+        mask = asu_id == i
+        prediction = prediction.reset_index()
+        assert np.array_equal(prediction[['H', 'K', 'L']].to_numpy('int64'), H[mask])
+        assert np.allclose(prediction['Iobs'].to_numpy('float32'), iobs[mask])
+        assert np.allclose(prediction['Ipred'].to_numpy('float32'), 2. * iobs[mask])
+
+    loc = rng.random(n_refls).astype('float32') + 1.
+    q = TruncatedNormal(loc, 0.1 * loc, 0., 10000.)
+    results = dm.get_results(q)
+    assert len(results) == 2
+
+    N = np.bincount(refl_id, minlength=n_refls)
+    F,SigF = q.mean().numpy(),q.stddev().numpy()
+    for i,(asu,result) in enumerate(zip(rac, results)):
+        assert result.cell.parameters == asu.cell.parameters
+        assert result.spacegroup.xhm() == asu.spacegroup.xhm()
+        assert result.merged
+        if not asu.anomalous:
+            for key,dtype in [('F', 'F'), ('SigF', 'Q'), ('N', 'R')]:
+                assert result[key].dtype.mtztype == dtype
+
+        mask = (rac.asu_ids.flatten() == i) & (N > 0)
+        h,k,l = rac.hkls[mask].T
+        expected = rs.DataSet({
+                'H' : h,
+                'K' : k,
+                'L' : l,
+                'F' : F[mask],
+                'SigF' : SigF[mask],
+                'N' : N[mask],
+            },
+            cell=asu.cell,
+            spacegroup=asu.spacegroup,
+            merged=True,
+        ).infer_mtz_dtypes().set_index(['H', 'K', 'L'])
+        keys = ['F', 'SigF', 'N']
+        if asu.anomalous:
+            expected = expected.unstack_anomalous()
+            keys = ['F(+)', 'SigF(+)', 'F(-)', 'SigF(-)', 'N(+)', 'N(-)']
+
+        expected = expected.sort_index()
+        result = result.sort_index()
+        assert expected.index.equals(result.index)
+        for key in keys:
+            assert np.allclose(
+                expected[key].to_numpy('float32', na_value=np.nan),
+                result[key].to_numpy('float32', na_value=np.nan),
+                equal_nan=True,
+            )
+
+def test_data_manager_from_old_pickle(laue_inputs, laue_reciprocal_asu_collection, tmp_path):
+    import pickle
+    rac = pickle.loads(pickle.dumps(laue_reciprocal_asu_collection))
+    dm = DataManager(laue_inputs, rac)
+
+    # Strip the attributes which older versions did not pickle
+    del dm._rng
+    for key in ['_centric', '_multiplicity', '_dHKL', '_hkls', '_asu_ids', '_sorted_ids', '_sorted_keys']:
+        delattr(rac, key)
+    for asu in rac:
+        for key in ['_centric', '_multiplicity', '_dHKL', '_id_grid']:
+            delattr(asu, key)
+
+    filename = str(tmp_path / "data_manager.pickle")
+    with open(filename, 'wb') as f:
+        pickle.dump(dm, f)
+    dm = DataManager.from_pickle(filename)
+
+    train,test = dm.split_data_by_refl(0.1)
+    train,test = dm.split_data_by_image(0.1)
+    p = dm.get_wilson_prior()
+    q = TruncatedNormal(p.mean(), p.stddev(), 0., 10000.)
+    results = dm.get_results(q)
     for result in results:
         assert result.N.min() > 0
@@ -58,3 +58,17 @@ def test_Wilson(mc_samples):
     for grad in grads:
         assert np.all(np.isfinite(grad))
 
+
+@pytest.mark.parametrize('mc_samples', [(), 1, 3])
+@pytest.mark.parametrize('sigma_shape', [(), (100,)])
+def test_Wilson_matches_reference(mc_samples, sigma_shape):
+    centric = np.random.randint(0, 2, 100).astype(bool)
+    epsilon = np.random.randint(1, 6, 100).astype(np.float32)
+    sigma = (np.random.random(sigma_shape) + 0.5).astype(np.float32)
+    prior = WilsonPrior(centric, epsilon, sigma)
+
+    z = np.random.random(np.shape(np.empty(mc_samples)) + (100,)).astype(np.float32)
+
+    expected = tf.where(centric, Centric(epsilon, sigma).log_prob(z), Acentric(epsilon, sigma).log_prob(z))
+    assert np.allclose(expected, prior.log_prob(z), rtol=1e-5)
+    assert np.allclose(np.exp(expected), prior.prob(z), rtol=1e-5)